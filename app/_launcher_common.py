@@ -0,0 +1,255 @@
+# Helpers shared by desktop_launcher.py and server_launcher.py.
+from __future__ import annotations
+
+import atexit
+import functools
+import logging
+import logging.handlers
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+import traceback
+import types
+
+import uvicorn
+
+# The environment doesn't change while a launcher runs: read it once, and never
+# again from the crash path.
+ENV = types.MappingProxyType(dict(os.environ))
+
+
+def appdata_dir() -> str:
+    base = ENV.get("LOCALAPPDATA") or ENV.get("APPDATA")
+    if base:
+        return os.path.join(base, "VixfloStream Downloader")
+    return os.path.join(os.path.expanduser("~"), "VixfloStream Downloader")
+
+
+def _probe_write(d: str) -> bool:
+    probe = os.path.join(d, ".write_test")
+    try:
+        with open(probe, "w", encoding="utf-8") as f:
+            f.write("ok")
+        os.remove(probe)
+        return True
+    except Exception:
+        return False
+
+
+def pick_writable_dir(*candidates: str) -> str:
+    for d in candidates:
+        try:
+            os.makedirs(d, exist_ok=True)
+        except Exception:
+            continue
+        if not os.access(d, os.W_OK):
+            continue
+        # os.access() ignores Windows ACLs, so confirm with a real write there.
+        if os.name == "nt" and not _probe_write(d):
+            continue
+        return d
+    return candidates[0] if candidates else os.getcwd()
+
+
+APPDATA_DIR = appdata_dir()
+HOST = sys.intern(ENV.get("AVE_HOST", "127.0.0.1"))
+LOG_LEVEL = sys.intern(ENV.get("AVE_LOG_LEVEL", "info"))
+
+
+# Where logs may go, in order of preference: next to the EXE, per-user app data, TEMP.
+_LOG_DIR_CANDIDATES: tuple[str, ...] = (
+    os.path.join(os.path.dirname(os.path.abspath(sys.executable or "")), "logs"),
+    os.path.join(APPDATA_DIR, "logs"),
+    os.path.join(ENV.get("TEMP", os.getcwd()), "VixfloStreamDownloader", "logs"),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def log_dir() -> str:
+    return pick_writable_dir(*_LOG_DIR_CANDIDATES)
+
+
+@functools.lru_cache(maxsize=1)
+def get_asgi_app():
+    # IMPORTANT for PyInstaller builds:
+    # If we pass a string like "app.main:app", Uvicorn imports it dynamically at
+    # runtime and PyInstaller may not bundle the local `app` package.
+    from app.main import app as asgi_app  # noqa: WPS433
+
+    return asgi_app
+
+
+def server_impls() -> tuple[str, str]:
+    # Name the fast loop/parser explicitly so a frozen build that silently ships
+    # without the uvicorn[standard] wheels is visible, but fall back cleanly.
+    loop_impl = "asyncio"
+    if sys.platform != "win32":
+        try:
+            import uvloop  # noqa: F401
+
+            loop_impl = "uvloop"
+        except ImportError:
+            pass
+
+    try:
+        import httptools  # noqa: F401
+
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "h11"
+    return loop_impl, http_impl
+
+
+# Uvicorn loggers only enqueue records; a single background listener thread owns
+# the log file, so disk writes never block the event loop.
+_LOG_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def _queue_handler() -> logging.Handler:
+    return logging.handlers.QueueHandler(_LOG_QUEUE)
+
+
+# Records are batched (MemoryHandler) and written through a 64 KB file buffer.
+# Both are flushed every 30 s, immediately on ERROR, on shutdown and on fatal crashes.
+_LOG_FLUSH_INTERVAL_S = 30.0
+_log_listener: logging.handlers.QueueListener | None = None
+_log_handlers: list[logging.Handler] = []
+_log_flush_stop = threading.Event()
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    def _open(self):
+        # 64 KB block buffer; with delay=True the file is only created on first emit.
+        return open(self.baseFilename, self.mode, buffering=64 * 1024, encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Unlike StreamHandler.emit, don't flush after every record.
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def flush_logs() -> None:
+    for handler in _log_handlers:
+        try:
+            handler.flush()
+        except Exception:
+            pass
+
+
+def _flush_logs_periodically() -> None:
+    while not _log_flush_stop.wait(_LOG_FLUSH_INTERVAL_S):
+        flush_logs()
+
+
+def start_logging(log_path: str) -> None:
+    global _log_listener
+
+    file_handler = _BufferedFileHandler(log_path, mode="a", encoding="utf-8", delay=True)
+    file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+    memory_handler = logging.handlers.MemoryHandler(512, flushLevel=logging.ERROR, target=file_handler)
+    # Order matters for flushing: drain the batch into the file buffer first.
+    _log_handlers[:] = [memory_handler, file_handler]
+
+    _log_listener = logging.handlers.QueueListener(_LOG_QUEUE, memory_handler, respect_handler_level=True)
+    _log_listener.start()
+    threading.Thread(target=_flush_logs_periodically, name="log-flush", daemon=True).start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    global _log_listener
+
+    if _log_listener is not None:
+        # Drains the queue into the handlers before returning.
+        _log_listener.stop()
+        _log_listener = None
+    _log_flush_stop.set()
+    for handler in _log_handlers:
+        handler.close()
+    _log_handlers.clear()
+
+
+def safe_uvicorn_log_config(level: str) -> dict:
+    # Uvicorn's default LOGGING_CONFIG may call `stream.isatty()`. In PyInstaller
+    # `--noconsole` mode, streams can be missing/None, causing a crash at startup.
+    # Use a simple file-based config instead.
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {
+            "queue": {
+                # Factory form: works the same on every Python version's dictConfig.
+                "()": _queue_handler,
+            },
+        },
+        "loggers": {
+            "uvicorn": {"handlers": ["queue"], "level": level.upper(), "propagate": False},
+            "uvicorn.error": {"handlers": ["queue"], "level": level.upper(), "propagate": False},
+            "uvicorn.access": {"handlers": ["queue"], "level": level.upper(), "propagate": False},
+        },
+    }
+
+
+def write_fatal_log(where: str, exc: BaseException) -> None:
+    # Get buffered Uvicorn log lines on disk first; they usually explain the crash.
+    flush_logs()
+    try:
+        path = os.path.join(log_dir(), where)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n=== FATAL ===\n")
+            f.write(time.strftime("%Y-%m-%d %H:%M:%S"))
+            f.write("\n")
+            f.write(repr(exc))
+            f.write("\n")
+            f.write(traceback.format_exc())
+            f.write("\n")
+    except Exception:
+        pass
+
+
+def run_server(
+    asgi_app,
+    host: str,
+    port: int,
+    log_name: str,
+    sockets: list[socket.socket] | None = None,
+) -> None:
+    # When frozen with PyInstaller, prefer logging to a file next to the EXE.
+    log_config = None
+    log_path: str | None = None
+    if getattr(sys, "frozen", False):
+        log_path = os.path.join(log_dir(), log_name)
+        log_config = safe_uvicorn_log_config(level=LOG_LEVEL)
+
+    loop_impl, http_impl = server_impls()
+    config = uvicorn.Config(
+        asgi_app,
+        host=host,
+        port=port,
+        loop=loop_impl,
+        http=http_impl,
+        log_level=LOG_LEVEL,
+        log_config=log_config,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+    # uvicorn.Config applies log_config via dictConfig, which closes every handler
+    # that already exists; only create the file/memory handlers after it.
+    if log_path is not None:
+        start_logging(log_path)
+    server = uvicorn.Server(config)
+    try:
+        server.run(sockets=sockets)
+    finally:
+        # Flush whatever is still queued/buffered before the process exits.
+        stop_logging()
@@ -1,25 +1,37 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import os
+import re
+import secrets
 import shutil
 import sys
+import threading
+import urllib.parse
 from datetime import datetime, timezone
 import math
-import uuid
+import mimetypes
 from concurrent.futures import Future, ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType, ModuleType
 from typing import Literal
 import time
+from collections import OrderedDict, deque
 
-from fastapi import FastAPI, Form, HTTPException, Request
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import FastAPI, Form, HTTPException, Request, Response
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response as StarletteResponse
+from starlette.staticfiles import NotModifiedResponse
 from fastapi.templating import Jinja2Templates
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from dotenv import load_dotenv
+import orjson
 
 
 def _user_data_dir() -> Path:
@@ -54,6 +66,7 @@ PROJECT_DIR = _project_dir()
 load_dotenv(PROJECT_DIR / ".env")
 
 APP_BUILD = datetime.now(timezone.utc).isoformat(timespec="seconds")
+FROZEN = bool(getattr(sys, "frozen", False))
 
 # Branding (shown in UI footer and window titles)
 APP_PRODUCT_NAME = "VixfloStream Downloader"
@@ -68,12 +81,14 @@ DEFAULT_HTTP_HEADERS: dict[str, str] = {
     ),
     "Accept-Language": "ro-RO,ro;q=0.9,en-US;q=0.8,en;q=0.7",
 }
+# Read-only view shared by every yt-dlp instance instead of handing out the mutable dict.
+_DEFAULT_HTTP_HEADERS_FROZEN = MappingProxyType(DEFAULT_HTTP_HEADERS)
 
 TEMPLATES_DIR = PROJECT_DIR / "templates"
 STATIC_DIR = PROJECT_DIR / "static"
 ASSETS_DIR = PROJECT_DIR / "assets"
 
-if getattr(sys, "frozen", False):
+if FROZEN:
     exe_dir = Path(sys.executable).resolve().parent
     candidate = exe_dir / "downloads"
     if _ensure_writable_dir(candidate):
@@ -85,59 +100,178 @@ else:
 
 DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
-class ForwardedPrefixMiddleware(BaseHTTPMiddleware):
+_PROTO_KEY = b"x-forwarded-proto"
+_HOST_KEY = b"x-forwarded-host"
+
+
+class ForwardedPrefixMiddleware:
     def __init__(self, app: ASGIApp, header_name: str = "x-forwarded-prefix") -> None:
-        super().__init__(app)
-        self._header_name = header_name
+        self.app = app
+        self._header_name = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        proto: str | None = None
+        host: str | None = None
+        prefix: str | None = None
+        prefix_key = self._header_name
+        for key, value in scope.get("headers") or ():
+            if key == _PROTO_KEY:
+                if proto is None:
+                    proto = value.decode("latin-1")
+            elif key == _HOST_KEY:
+                if host is None:
+                    host = value.decode("latin-1")
+            elif key == prefix_key and prefix is None:
+                prefix = value.decode("latin-1")
+
+        # Direct (non-proxied) requests, e.g. the desktop launcher on localhost.
+        if proto is None and host is None and prefix is None:
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         # Handle X-Forwarded-Proto (https from Apache)
-        proto = request.headers.get("x-forwarded-proto")
         if proto:
-            request.scope["scheme"] = proto
+            scope["scheme"] = proto
 
         # Handle X-Forwarded-Host (vixflodev.ro from Apache)
-        host = request.headers.get("x-forwarded-host")
         if host:
             # Update server tuple (host, port) - use 443 for https
-            port = 443 if request.scope.get("scheme") == "https" else 80
-            request.scope["server"] = (host, port)
+            port = 443 if scope.get("scheme") == "https" else 80
+            scope["server"] = (host, port)
 
         # Handle X-Forwarded-Prefix (/VixfloStream)
-        prefix = request.headers.get(self._header_name)
         if prefix:
             prefix = prefix.strip()
             if not prefix.startswith("/"):
                 prefix = "/" + prefix
             prefix = prefix.rstrip("/")
-            request.scope["root_path"] = prefix
+            scope["root_path"] = prefix
 
             # Some reverse-proxy setups forward the full prefixed path (e.g. /AVEProiect/static/...)
             # instead of stripping it. If that happens, strip it here so routing/static files work.
-            path = request.scope.get("path") or ""
+            path = scope.get("path") or ""
             if path == prefix or path.startswith(prefix + "/"):
                 new_path = path[len(prefix) :]
                 if not new_path:
                     new_path = "/"
-                request.scope["path"] = new_path
-                request.scope["raw_path"] = new_path.encode("utf-8")
-        return await call_next(request)
+                scope["path"] = new_path
+                scope["raw_path"] = new_path.encode("utf-8")
+
+        await self.app(scope, receive, send)
+
+
+_BUILD_HEADER = (b"x-ave-build", APP_BUILD.encode("latin-1"))
+_FROZEN_HEADER = (b"x-ave-frozen", b"1" if FROZEN else b"0")
+
+
+class BuildHeaderMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers") or ())
+                headers.append(_BUILD_HEADER)
+                headers.append(_FROZEN_HEADER)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """FileResponse that uses the ASGI zero-copy send extension when the server offers it."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Ranges, HEAD and servers without the extension use Starlette's chunked path.
+        extensions = scope.get("extensions") or {}
+        if (
+            "http.response.zerocopysend" not in extensions
+            or self.stat_result is None
+            or scope["method"].upper() == "HEAD"
+            or any(k == b"range" for k, _ in scope.get("headers") or ())
+        ):
+            await super().__call__(scope, receive, send)
+            return
 
+        fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": "http.response.zerocopysend", "file": fd, "more_body": False})
+        finally:
+            os.close(fd)
+
+        if self.background is not None:
+            await self.background()
+
+    def _should_use_range(self, http_if_range: str, stat_result: os.stat_result) -> bool:
+        # Honour If-Range against a caller-supplied ETag, not only Starlette's own md5 one.
+        if http_if_range == self.headers.get("etag"):
+            return True
+        return super()._should_use_range(http_if_range, stat_result)
+
+
+# Behind Apache with mod_xsendfile, let the front proxy stream static files itself.
+XSENDFILE = os.getenv("AVE_XSENDFILE") == "1"
+
+
+class CachedStaticFiles(StaticFiles):
+    # URLs carrying a content hash (?v=..., see _asset_version) never change, so they
+    # can be cached for a year; bare URLs are revalidated through ETag/Last-Modified.
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> StarletteResponse:
+        query = (scope.get("query_string") or b"").decode("latin-1")
+        if "v" in urllib.parse.parse_qs(query):
+            cache_control = "public, max-age=31536000, immutable"
+        else:
+            cache_control = "no-cache"
+
+        response = ZeroCopyFileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            headers={"Cache-Control": cache_control},
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
 
-class BuildHeaderMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-AVE-Build"] = APP_BUILD
-        response.headers["X-AVE-Frozen"] = "1" if getattr(sys, "frozen", False) else "0"
+        if XSENDFILE:
+            headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+            headers["X-Sendfile"] = os.path.abspath(full_path)
+            return StarletteResponse(status_code=status_code, headers=headers)
         return response
 
 
-app = FastAPI(title=APP_PRODUCT_NAME, version=APP_VERSION)
+@functools.lru_cache(maxsize=64)
+def _asset_version(rel_path: str) -> str:
+    """Short content hash of a file under PROJECT_DIR, used to version static URLs."""
+    try:
+        data = (PROJECT_DIR / rel_path).read_bytes()
+    except OSError:
+        return APP_VERSION
+    return hashlib.md5(data, usedforsecurity=False).hexdigest()[:10]
+
+
+app = FastAPI(title=APP_PRODUCT_NAME, version=APP_VERSION, default_response_class=ORJSONResponse)
 app.add_middleware(ForwardedPrefixMiddleware)
 app.add_middleware(BuildHeaderMiddleware)
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+app.mount("/static", CachedStaticFiles(directory=str(STATIC_DIR)), name="static")
 if ASSETS_DIR.exists():
-    app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
+    app.mount("/assets", CachedStaticFiles(directory=str(ASSETS_DIR)), name="assets")
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
@@ -146,25 +280,33 @@ templates.env.globals.update(
     app_product_name=APP_PRODUCT_NAME,
     app_brand_name=APP_BRAND_NAME,
     app_version=APP_VERSION,
+    asset_version=_asset_version,
 )
 
 
+_BASE_CTX: dict[str, object] = {
+    "app_product_name": APP_PRODUCT_NAME,
+    "app_brand_name": APP_BRAND_NAME,
+    "app_version": APP_VERSION,
+}
+
+
 def _template_base_context(request: Request) -> dict[str, object]:
-    root_path = request.scope.get("root_path", "") or ""
-    return {
-        "request": request,
-        "root_path": root_path,
-        "app_product_name": APP_PRODUCT_NAME,
-        "app_brand_name": APP_BRAND_NAME,
-        "app_version": APP_VERSION,
-    }
+    return {"request": request, "root_path": request.scope.get("root_path") or "", **_BASE_CTX}
+
+
+@app.on_event("startup")
+def _precompile_templates() -> None:
+    # Parse/compile every template up front so the first page view doesn't pay for it.
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
 
 
 DownloadType = Literal["video", "audio"]
 AudioFormat = Literal["mp3", "original"]
 
 
-@dataclass
+@dataclass(slots=True, match_args=False)
 class Job:
     id: str
     status: Literal["queued", "running", "done", "error"]
@@ -173,9 +315,15 @@ class Job:
     url: str
     filename: str | None = None
     error: str | None = None
+    finished_at: float | None = None
+    # (loop, event) pairs of open /stream connections, woken on every status change.
+    listeners: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = field(
+        default_factory=set, repr=False, compare=False
+    )
 
 
-@dataclass
+# Immutable once built, so cached instances can be shared between threads as-is.
+@dataclass(slots=True, frozen=True, match_args=False)
 class Preview:
     url: str
     title: str | None
@@ -187,14 +335,162 @@ class Preview:
     extractor: str | None
     warning: str | None
     needs_cookies: bool
-    _ts: float
 
 
-_executor = ThreadPoolExecutor(max_workers=2)
-_jobs: dict[str, Job] = {}
-_futures: dict[str, Future[None]] = {}
-_preview_cache: dict[str, Preview] = {}
-_preview_lock = __import__("threading").Lock()
+WORKER_THREADS = int(os.getenv("AVE_WORKER_THREADS") or min(8, (os.cpu_count() or 2) * 2))
+# Jobs accepted but not finished yet; beyond this /download answers 503 instead of queueing forever.
+MAX_PENDING_JOBS = WORKER_THREADS * 4
+JOB_RETENTION_SECONDS = 3600.0
+
+_executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="ytdlp")
+_pending = threading.BoundedSemaphore(MAX_PENDING_JOBS)
+
+# Job registry split into shards (keyed on the first hex byte of the id) so status
+# polling and worker updates for different jobs do not contend on one lock.
+_JOB_SHARD_COUNT = 16
+_SHARDS: list[dict[str, Job]] = [{} for _ in range(_JOB_SHARD_COUNT)]
+_FUTURE_SHARDS: list[dict[str, Future[None]]] = [{} for _ in range(_JOB_SHARD_COUNT)]
+_SHARD_LOCKS: list[threading.Lock] = [threading.Lock() for _ in range(_JOB_SHARD_COUNT)]
+_last_reap = 0.0
+# Bounded LRU of url -> (expires_at, Preview); oldest entries are evicted first.
+_PREVIEW_CACHE_MAX = 512
+_PREVIEW_CACHE_TTL = 180.0
+_preview_cache: OrderedDict[str, tuple[float, Preview]] = OrderedDict()
+_preview_lock = threading.Lock()
+
+
+def _preview_cache_get(url: str) -> Preview | None:
+    now = time.monotonic()
+    with _preview_lock:
+        entry = _preview_cache.get(url)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del _preview_cache[url]
+            return None
+        _preview_cache.move_to_end(url)
+        return entry[1]
+
+
+def _preview_cache_put(url: str, preview: Preview) -> None:
+    expires_at = time.monotonic() + _PREVIEW_CACHE_TTL
+    with _preview_lock:
+        _preview_cache[url] = (expires_at, preview)
+        _preview_cache.move_to_end(url)
+        while len(_preview_cache) > _PREVIEW_CACHE_MAX:
+            _preview_cache.popitem(last=False)
+
+
+@dataclass
+class _InflightPreview:
+    future: Future[Preview]
+    waiters: int = 1
+
+
+# Previews block on network I/O inside yt-dlp; keep them off FastAPI's shared threadpool.
+_preview_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="preview")
+PREVIEW_TIMEOUT_SECONDS = 20.0
+_inflight: dict[str, _InflightPreview] = {}
+
+
+def _forget_inflight(url: str, inflight: _InflightPreview) -> None:
+    with _preview_lock:
+        if _inflight.get(url) is inflight:
+            del _inflight[url]
+
+
+def _preview_payload(p: Preview) -> dict[str, object]:
+    return {
+        "ok": True,
+        "url": p.url,
+        "title": p.title,
+        "uploader": p.uploader,
+        "description": p.description,
+        "duration": p.duration,
+        "duration_text": _human_duration(p.duration),
+        "thumbnail": p.thumbnail,
+        "webpage_url": p.webpage_url,
+        "extractor": p.extractor,
+        "warning": p.warning,
+        "needs_cookies": p.needs_cookies,
+    }
+
+
+def _shard_index(job_id: str) -> int:
+    try:
+        return int(job_id[:2], 16) & (_JOB_SHARD_COUNT - 1)
+    except ValueError:
+        # Not one of our ids; any shard will do since the lookup simply misses.
+        return 0
+
+
+def _shard_for(job_id: str) -> tuple[dict[str, Job], threading.Lock]:
+    i = _shard_index(job_id)
+    return _SHARDS[i], _SHARD_LOCKS[i]
+
+
+def _get_job(job_id: str) -> Job | None:
+    shard, lock = _shard_for(job_id)
+    with lock:
+        return shard.get(job_id)
+
+
+def _register_job(job: Job) -> None:
+    shard, lock = _shard_for(job.id)
+    with lock:
+        shard[job.id] = job
+
+
+def _unregister_job(job_id: str) -> None:
+    shard, lock = _shard_for(job_id)
+    with lock:
+        shard.pop(job_id, None)
+
+
+def _track_future(job_id: str, future: Future[None]) -> None:
+    i = _shard_index(job_id)
+    with _SHARD_LOCKS[i]:
+        _FUTURE_SHARDS[i][job_id] = future
+
+
+def _notify_job(job: Job) -> None:
+    # Called from worker threads (with the shard lock held) after a state change.
+    for loop, event in job.listeners:
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # Loop already closed (server shutting down).
+            pass
+
+
+def _reap_jobs() -> None:
+    # Forget finished jobs after an hour so the registries stay small.
+    # Files stay on disk; only the in-memory bookkeeping is dropped.
+    global _last_reap
+    now = time.monotonic()
+    if now - _last_reap < 60:
+        return
+    _last_reap = now
+
+    cutoff = now - JOB_RETENTION_SECONDS
+    for shard, futures, lock in zip(_SHARDS, _FUTURE_SHARDS, _SHARD_LOCKS):
+        with lock:
+            expired = [
+                job_id
+                for job_id, job in shard.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del shard[job_id]
+                futures.pop(job_id, None)
+
+
+def _queue_depth() -> int:
+    depth = 0
+    for futures, lock in zip(_FUTURE_SHARDS, _SHARD_LOCKS):
+        with lock:
+            depth += sum(1 for f in futures.values() if not f.done())
+    return depth
 
 
 def _human_duration(seconds: int | float | None) -> str | None:
@@ -217,47 +513,84 @@ def _human_duration(seconds: int | float | None) -> str | None:
     return f"{m}:{s:02d}"
 
 
-def _fix_mojibake(text: str | None) -> str | None:
-    if not text:
-        return text
-
-    # Heuristic: some extractors occasionally return text that looks like UTF-8 bytes
-    # decoded as Windows-1252/latin-1 (e.g. "â€™" instead of "’").
-    markers = ("â", "Ã", "ð")
-    if not any(m in text for m in markers):
-        return text
+# Heuristic: some extractors occasionally return text that looks like UTF-8 bytes
+# decoded as Windows-1252/latin-1 (e.g. "â€™" instead of "’").
+_MOJIBAKE_RE = re.compile("[âÃð]")
 
-    before = sum(text.count(m) for m in markers)
 
-    candidates: list[str] = []
+def _repair_mojibake(text: str) -> str:
+    best = text
+    best_score = len(_MOJIBAKE_RE.findall(text))
     for enc in ("cp1252", "latin-1"):
         try:
-            candidates.append(text.encode(enc, errors="ignore").decode("utf-8", errors="ignore"))
+            c = text.encode(enc, errors="ignore").decode("utf-8", errors="ignore")
         except Exception:
             continue
-
-    best = text
-    best_score = before
-    for c in candidates:
-        score = sum(c.count(m) for m in markers)
+        score = len(_MOJIBAKE_RE.findall(c))
         if score < best_score:
             best = c
             best_score = score
+            if not score:
+                # cp1252 usually fixes everything; no need to try latin-1.
+                break
 
     return best
 
 
+# Titles/uploaders repeat across previews and jobs; descriptions are too big to keep.
+_repair_mojibake_cached = functools.lru_cache(maxsize=1024)(_repair_mojibake)
+
+
+def _fix_mojibake(text: str | None) -> str | None:
+    if not text or not _MOJIBAKE_RE.search(text):
+        return text
+    if len(text) <= 512:
+        return _repair_mojibake_cached(text)
+    return _repair_mojibake(text)
+
+
 def _safe_remove_tree(path: Path) -> None:
     if path.exists():
         shutil.rmtree(path, ignore_errors=True)
 
 
+# Old job folders are renamed out of the way and deleted here, off the job's critical path.
+_gc_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gc")
+_TRASH_PREFIX = ".trash-"
+
+
+def _discard_dir(path: Path) -> None:
+    if not path.exists():
+        return
+    trash = path.with_name(f"{_TRASH_PREFIX}{path.name}-{time.time_ns()}")
+    try:
+        os.rename(path, trash)
+    except OSError:
+        # e.g. a file still open on Windows; fall back to deleting in place.
+        _safe_remove_tree(path)
+        return
+    _gc_executor.submit(_safe_remove_tree, trash)
+
+
+@app.on_event("startup")
+def _purge_trash() -> None:
+    # Leftovers from a previous run that exited before the background delete finished.
+    try:
+        with os.scandir(DOWNLOADS_DIR) as it:
+            leftovers = [Path(e.path) for e in it if e.name.startswith(_TRASH_PREFIX)]
+    except OSError:
+        return
+    for trash in leftovers:
+        _gc_executor.submit(_safe_remove_tree, trash)
+
+
+# Keep Unicode, but replace characters invalid on Windows filesystems (and C0 controls).
+_SANITIZE_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*'} | {chr(i): "_" for i in range(32)})
+_WS_RE = re.compile(r"\s+")
+
+
 def _sanitize_filename(name: str, max_len: int = 140) -> str:
-    # Keep Unicode, but remove characters invalid on Windows filesystems.
-    invalid = '<>:"/\\|?*'
-    cleaned = "".join(("_" if (c in invalid or ord(c) < 32) else c) for c in name)
-    cleaned = " ".join(cleaned.split())
-    cleaned = cleaned.strip(" .")
+    cleaned = _WS_RE.sub(" ", name.translate(_SANITIZE_TABLE)).strip(" .")
     if not cleaned:
         cleaned = "download"
 
@@ -268,23 +601,32 @@ def _sanitize_filename(name: str, max_len: int = 140) -> str:
 
 
 def _dedupe_path(path: Path) -> Path:
-    if not path.exists():
+    if not os.path.lexists(path):
         return path
-    stem = path.stem
+    base = os.path.join(path.parent, path.stem)
     suffix = path.suffix
-    parent = path.parent
     for i in range(1, 100):
-        candidate = parent / f"{stem} ({i}){suffix}"
-        if not candidate.exists():
-            return candidate
+        candidate = f"{base} ({i}){suffix}"
+        if not os.path.lexists(candidate):
+            return Path(candidate)
     return path
 
 
 def _pick_latest_file(folder: Path) -> Path:
-    files = [p for p in folder.glob("*") if p.is_file()]
-    if not files:
+    # Single readdir pass; DirEntry caches stat data so each file is stat'ed at most once.
+    best: str | None = None
+    best_mtime = -1.0
+    with os.scandir(folder) as it:
+        for entry in it:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            mtime = entry.stat(follow_symlinks=False).st_mtime
+            if mtime > best_mtime:
+                best_mtime = mtime
+                best = entry.path
+    if best is None:
         raise RuntimeError("Nu s-a generat niciun fișier.")
-    return max(files, key=lambda p: p.stat().st_mtime)
+    return Path(best)
 
 
 def _best_thumbnail(info: dict | object) -> str | None:
@@ -318,6 +660,7 @@ def _best_thumbnail(info: dict | object) -> str | None:
     return best_url
 
 
+@functools.lru_cache(maxsize=1)
 def _maybe_cookiefile() -> str | None:
     env = os.getenv("AVE_COOKIES_FILE")
     if env:
@@ -336,6 +679,7 @@ def _looks_like_youtube(url: str) -> bool:
     return "youtube.com" in u or "youtu.be" in u
 
 
+@functools.lru_cache(maxsize=1)
 def _ffmpeg_dir() -> Path | None:
     """Return directory containing ffmpeg.exe/ffprobe.exe if found."""
     env = os.getenv("AVE_FFMPEG_PATH")
@@ -364,47 +708,69 @@ def _ffmpeg_dir() -> Path | None:
     return None
 
 
-def _run_ytdlp(job_id: str) -> None:
-    job = _jobs[job_id]
-    job.status = "running"
+# Filesystem probes are resolved once at startup; use /admin/refresh-config (local
+# clients only) after swapping cookies.txt or installing FFmpeg while running.
+FFMPEG_DIR = _ffmpeg_dir()
+COOKIEFILE = _maybe_cookiefile()
 
-    import yt_dlp  # local import so app can still start if deps missing
 
-    class _JobLogger:
-        def __init__(self) -> None:
-            self.lines: list[str] = []
+_YTDLP_VERBOSE = bool(os.getenv("AVE_YTDLP_VERBOSE"))
+_YTDLP_MISSING = "yt-dlp nu este disponibil."
 
-        def _add(self, level: str, msg: str) -> None:
-            text = f"[{level}] {msg}".strip()
-            self.lines.append(text)
-            if len(self.lines) > 200:
-                self.lines = self.lines[-200:]
+# yt-dlp is imported lazily (at startup, see _preload_ytdlp) so the app can still
+# start and serve /health and /diagnostics if the dependency is missing.
+# A failed import is remembered too (None), so it isn't retried on every request.
+_YTDLP_UNSET = object()
+_YTDLP: ModuleType | None | object = _YTDLP_UNSET
 
-        def debug(self, msg: str) -> None:
-            if os.getenv("AVE_YTDLP_VERBOSE"):
-                self._add("debug", msg)
 
-        def warning(self, msg: str) -> None:
-            self._add("warning", msg)
+def _get_ytdlp() -> ModuleType | None:
+    global _YTDLP
+    if _YTDLP is _YTDLP_UNSET:
+        try:
+            import yt_dlp
+        except ImportError:
+            _YTDLP = None
+        else:
+            _YTDLP = yt_dlp
+    return _YTDLP  # type: ignore[return-value]
 
-        def error(self, msg: str) -> None:
-            self._add("error", msg)
 
-    logger = _JobLogger()
+@app.on_event("startup")
+def _preload_ytdlp() -> None:
+    _get_ytdlp()
 
-    job_dir = DOWNLOADS_DIR / job_id
-    _safe_remove_tree(job_dir)
-    job_dir.mkdir(parents=True, exist_ok=True)
 
-    cookiefile = _maybe_cookiefile()
+class _JobLogger:
+    # Ring buffers: the last 200 lines overall, and the last 25 for the error message.
+    __slots__ = ("lines", "tail")
 
-    ffmpeg_dir = _ffmpeg_dir()
+    def __init__(self) -> None:
+        self.lines: deque[str] = deque(maxlen=200)
+        self.tail: deque[str] = deque(maxlen=25)
 
-    # IMPORTANT (Windows): some platforms (notably Facebook) produce titles with characters
-    # that are illegal in filenames (e.g. '|'), causing "unable to open for writing".
-    # Download using a safe template, then rename after download.
+    def _add(self, level: str, msg: str) -> None:
+        text = f"[{level}] {msg}".strip()
+        self.lines.append(text)
+        self.tail.append(text)
+
+    def debug(self, msg: str) -> None:
+        if _YTDLP_VERBOSE:
+            self._add("debug", msg)
+
+    def warning(self, msg: str) -> None:
+        self._add("warning", msg)
+
+    def error(self, msg: str) -> None:
+        self._add("error", msg)
+
+
+def _build_ydl_templates(
+    ffmpeg_dir: Path | None, cookiefile: str | None
+) -> dict[tuple[str, str], dict[str, object]]:
+    # Download options only vary with (download_type, audio_format) once FFmpeg and
+    # cookies are known, so build every combination up front; jobs add outtmpl/logger.
     common_opts: dict[str, object] = {
-        "outtmpl": str(job_dir / "%(id)s.%(ext)s"),
         "noplaylist": True,
         "quiet": True,
         "no_warnings": True,
@@ -412,8 +778,7 @@ def _run_ytdlp(job_id: str) -> None:
         "fragment_retries": 5,
         "extractor_retries": 3,
         "socket_timeout": 20,
-        "logger": logger,
-        "http_headers": DEFAULT_HTTP_HEADERS,
+        "http_headers": _DEFAULT_HTTP_HEADERS_FROZEN,
         "user_agent": DEFAULT_HTTP_HEADERS["User-Agent"],
         "windowsfilenames": True,
     }
@@ -430,34 +795,74 @@ def _run_ytdlp(job_id: str) -> None:
     # No YouTube-specific config needed; yt-dlp handles client selection automatically.
     # Forcing specific player_client can cause PO Token issues.
 
-    if job.download_type == "audio":
-        # MP3 needs FFmpeg. If FFmpeg isn't installed, we still download audio
-        # in the best available original container (m4a/webm/etc.).
-        if job.audio_format == "mp3" and ffmpeg_dir:
-            ydl_opts = {
-                **common_opts,
-                "format": "bestaudio/best",
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": "mp3",
-                        "preferredquality": "192",
-                    }
-                ],
-            }
-        else:
-            # Either "original" requested or no ffmpeg available.
-            ydl_opts = {**common_opts, "format": "bestaudio/best"}
+    # MP3 needs FFmpeg. If FFmpeg isn't installed, we still download audio
+    # in the best available original container (m4a/webm/etc.).
+    if ffmpeg_dir:
+        audio_mp3: dict[str, object] = {
+            **common_opts,
+            "format": "bestaudio/best",
+            "postprocessors": [
+                {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": "mp3",
+                    "preferredquality": "192",
+                }
+            ],
+        }
     else:
-        # Fără FFmpeg, combinarea (bestvideo + bestaudio) poate eșua.
-        # Ca să funcționeze out-of-the-box, alegem un format "best" într-un singur fișier.
-        # Dacă FFmpeg este disponibil, folosim calitate maximă (video+audio) și merge în MP4.
-        if ffmpeg_dir:
-            ydl_opts = {**common_opts, "format": "bv*+ba/best", "merge_output_format": "mp4"}
-        else:
-            ydl_opts = {**common_opts, "format": "best[ext=mp4]/best"}
+        audio_mp3 = {**common_opts, "format": "bestaudio/best"}
+    audio_original = {**common_opts, "format": "bestaudio/best"}
+
+    # Fără FFmpeg, combinarea (bestvideo + bestaudio) poate eșua.
+    # Ca să funcționeze out-of-the-box, alegem un format "best" într-un singur fișier.
+    # Dacă FFmpeg este disponibil, folosim calitate maximă (video+audio) și merge în MP4.
+    if ffmpeg_dir:
+        video = {**common_opts, "format": "bv*+ba/best", "merge_output_format": "mp4"}
+    else:
+        video = {**common_opts, "format": "best[ext=mp4]/best"}
+
+    return {
+        ("audio", "mp3"): audio_mp3,
+        ("audio", "original"): audio_original,
+        # Audio format is ignored for video downloads.
+        ("video", "mp3"): video,
+        ("video", "original"): video,
+    }
+
+
+_YDL_TEMPLATES = _build_ydl_templates(FFMPEG_DIR, COOKIEFILE)
+
+
+def _run_ytdlp(job_id: str) -> None:
+    job = _get_job(job_id)
+    if job is None:
+        return
+    _, job_lock = _shard_for(job_id)
+    with job_lock:
+        job.status = "running"
+        _notify_job(job)
+
+    yt_dlp = _get_ytdlp()
+    logger = _JobLogger()
+
+    job_dir = DOWNLOADS_DIR / job_id
+    _discard_dir(job_dir)
+    job_dir.mkdir(parents=True, exist_ok=True)
+
+    cookiefile = COOKIEFILE
+
+    # IMPORTANT (Windows): some platforms (notably Facebook) produce titles with characters
+    # that are illegal in filenames (e.g. '|'), causing "unable to open for writing".
+    # Download using a safe template, then rename after download.
+    ydl_opts = {
+        **_YDL_TEMPLATES[(job.download_type, job.audio_format)],
+        "outtmpl": str(job_dir / "%(id)s.%(ext)s"),
+        "logger": logger,
+    }
 
     try:
+        if yt_dlp is None:
+            raise RuntimeError(_YTDLP_MISSING)
         info: object | None = None
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore[arg-type]
             extracted = ydl.extract_info(job.url, download=True)
@@ -487,11 +892,13 @@ def _run_ytdlp(job_id: str) -> None:
                 # If rename fails for any reason, keep the safe id-based filename.
                 pass
 
-        job.filename = produced.name
-        job.status = "done"
+        with job_lock:
+            job.filename = produced.name
+            job.status = "done"
+            job.finished_at = time.monotonic()
+            _notify_job(job)
 
     except Exception as exc:  # noqa: BLE001
-        job.status = "error"
         base = str(exc) or exc.__class__.__name__
         hint = ""
         low = base.lower()
@@ -506,9 +913,13 @@ def _run_ytdlp(job_id: str) -> None:
             hint = "\n\nSugestie (Facebook): deseori e nevoie de cookies ca să meargă stabil. Setează AVE_COOKIES_FILE sau pune un cookies.txt în proiect."
 
         log_tail = ""
-        if logger.lines:
-            log_tail = "\n\nDetalii (yt-dlp):\n" + "\n".join(logger.lines[-25:])
-        job.error = base + hint + log_tail
+        if logger.tail:
+            log_tail = "\n\nDetalii (yt-dlp):\n" + "\n".join(logger.tail)
+        with job_lock:
+            job.error = base + hint + log_tail
+            job.status = "error"
+            job.finished_at = time.monotonic()
+            _notify_job(job)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -519,33 +930,15 @@ def index(request: Request):
     )
 
 
-@app.get("/api/preview")
-def preview(url: str):
-    url = (url or "").strip()
-    if not url:
-        raise HTTPException(status_code=400, detail="URL gol")
+# Idle preview YoutubeDL instances, keyed by the options they were built with.
+# Building one costs extractor setup and cookie-jar parsing; metadata-only probes
+# leave no per-call state behind, so instances are reused (one caller at a time).
+# Downloads keep a fresh instance per job: postprocessors, outtmpl and logger differ.
+_ydl_pool: dict[tuple[bool, str | None], list[object]] = {}
+_ydl_pool_lock = threading.Lock()
 
-    now = time.time()
-    with _preview_lock:
-        cached = _preview_cache.get(url)
-        if cached and (now - cached._ts) < 180:
-            return {
-                "ok": True,
-                "url": cached.url,
-                "title": cached.title,
-                "uploader": cached.uploader,
-                "description": cached.description,
-                "duration": cached.duration,
-                "duration_text": _human_duration(cached.duration),
-                "thumbnail": cached.thumbnail,
-                "webpage_url": cached.webpage_url,
-                "extractor": cached.extractor,
-                "warning": cached.warning,
-                "needs_cookies": cached.needs_cookies,
-            }
-
-    import yt_dlp
 
+def _preview_ydl_opts(youtube: bool, cookiefile: str | None) -> dict[str, object]:
     ydl_opts: dict[str, object] = {
         "quiet": True,
         "no_warnings": True,
@@ -553,84 +946,143 @@ def preview(url: str):
         "skip_download": True,
         "retries": 2,
         "socket_timeout": 15,
-        "http_headers": DEFAULT_HTTP_HEADERS,
+        "http_headers": _DEFAULT_HTTP_HEADERS_FROZEN,
         "user_agent": DEFAULT_HTTP_HEADERS["User-Agent"],
     }
-
-    cookiefile = _maybe_cookiefile()
     if cookiefile:
         ydl_opts["cookiefile"] = cookiefile
-
-    if _looks_like_youtube(url):
+    if youtube:
         ydl_opts["extractor_args"] = {"youtube": {"player_client": ["android", "web_safari"]}}
+    return ydl_opts
+
+
+def _discard_ydl(ydl: object) -> None:
+    # Not ydl.close(): that also saves the instance's cookie jar back to cookiefile,
+    # overwriting a cookies.txt swapped in since. Only release the network sessions.
+    director = getattr(ydl, "__dict__", {}).pop("_request_director", None)
+    if director is not None:
+        try:
+            director.close()
+        except Exception:
+            pass
+
+
+def _clear_ydl_pool() -> None:
+    with _ydl_pool_lock:
+        idle = [ydl for pool in _ydl_pool.values() for ydl in pool]
+        _ydl_pool.clear()
+    for ydl in idle:
+        _discard_ydl(ydl)
+
+
+def _extract_preview(url: str) -> Preview:
+    yt_dlp = _get_ytdlp()
+    if yt_dlp is None:
+        raise RuntimeError(_YTDLP_MISSING)
+
+    cookiefile = COOKIEFILE
+    key = (_looks_like_youtube(url), cookiefile)
+    with _ydl_pool_lock:
+        pool = _ydl_pool.get(key)
+        ydl = pool.pop() if pool else None
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(_preview_ydl_opts(*key))  # type: ignore[arg-type]
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore[arg-type]
-            info = ydl.extract_info(url, download=False)
+        info = ydl.extract_info(url, download=False)  # type: ignore[attr-defined]
+    except Exception:
+        # Don't recycle an instance that just failed; its state is unknown.
+        _discard_ydl(ydl)
+        raise
+    with _ydl_pool_lock:
+        _ydl_pool.setdefault(key, []).append(ydl)
+
+    # Sometimes extract_info returns a playlist/container.
+    if isinstance(info, dict) and info.get("_type") in {"playlist", "multi_video"}:
+        entries = info.get("entries") or []
+        info = entries[0] if entries else info
+
+    extractor = (info.get("extractor_key") if isinstance(info, dict) else None) or (
+        info.get("extractor") if isinstance(info, dict) else None
+    )
 
-        # Sometimes extract_info returns a playlist/container.
-        if isinstance(info, dict) and info.get("_type") in {"playlist", "multi_video"}:
-            entries = info.get("entries") or []
-            info = entries[0] if entries else info
+    title = _fix_mojibake((info.get("title") if isinstance(info, dict) else None))
+    uploader = _fix_mojibake((info.get("uploader") if isinstance(info, dict) else None))
+    description = _fix_mojibake((info.get("description") if isinstance(info, dict) else None))
+    thumbnail = _best_thumbnail(info) if isinstance(info, dict) else None
+    webpage_url = (info.get("webpage_url") if isinstance(info, dict) else None)
+
+    needs_cookies = False
+    warning: str | None = None
+    if isinstance(extractor, str) and extractor.lower().startswith("facebook"):
+        # Facebook often blocks metadata unless cookies are provided.
+        # Return a non-fatal hint so UI can guide the user.
+        if not cookiefile:
+            needs_cookies = True
+            if not title or not thumbnail or not description:
+                warning = (
+                    "Facebook: preview poate fi limitat fără cookies. "
+                    "Dacă nu apar titlu/poză/descriere, setează cookies (AVE_COOKIES_FILE sau cookies.txt)."
+                )
+
+    p = Preview(
+        url=url,
+        title=title,
+        uploader=uploader,
+        description=description,
+        duration=(info.get("duration") if isinstance(info, dict) else None),
+        thumbnail=thumbnail,
+        webpage_url=webpage_url,
+        extractor=extractor,
+        warning=warning,
+        needs_cookies=needs_cookies,
+    )
 
-        extractor = (info.get("extractor_key") if isinstance(info, dict) else None) or (
-            info.get("extractor") if isinstance(info, dict) else None
-        )
+    _preview_cache_put(url, p)
+    return p
 
-        title = _fix_mojibake((info.get("title") if isinstance(info, dict) else None))
-        uploader = _fix_mojibake((info.get("uploader") if isinstance(info, dict) else None))
-        description = _fix_mojibake((info.get("description") if isinstance(info, dict) else None))
-        thumbnail = _best_thumbnail(info) if isinstance(info, dict) else None
-        webpage_url = (info.get("webpage_url") if isinstance(info, dict) else None)
-
-        needs_cookies = False
-        warning: str | None = None
-        if isinstance(extractor, str) and extractor.lower().startswith("facebook"):
-            # Facebook often blocks metadata unless cookies are provided.
-            # Return a non-fatal hint so UI can guide the user.
-            if not cookiefile:
-                needs_cookies = True
-                if not title or not thumbnail or not description:
-                    warning = (
-                        "Facebook: preview poate fi limitat fără cookies. "
-                        "Dacă nu apar titlu/poză/descriere, setează cookies (AVE_COOKIES_FILE sau cookies.txt)."
-                    )
-
-        p = Preview(
-            url=url,
-            title=title,
-            uploader=uploader,
-            description=description,
-            duration=(info.get("duration") if isinstance(info, dict) else None),
-            thumbnail=thumbnail,
-            webpage_url=webpage_url,
-            extractor=extractor,
-            warning=warning,
-            needs_cookies=needs_cookies,
-            _ts=now,
-        )
 
-        with _preview_lock:
-            _preview_cache[url] = p
-
-        return {
-            "ok": True,
-            "url": p.url,
-            "title": p.title,
-            "uploader": p.uploader,
-            "description": p.description,
-            "duration": p.duration,
-            "duration_text": _human_duration(p.duration),
-            "thumbnail": p.thumbnail,
-            "webpage_url": p.webpage_url,
-            "extractor": p.extractor,
-            "warning": p.warning,
-            "needs_cookies": p.needs_cookies,
-        }
+@app.get("/api/preview")
+async def preview(url: str, response: Response):
+    url = (url or "").strip()
+    if not url:
+        raise HTTPException(status_code=400, detail="URL gol")
+
+    cached = _preview_cache_get(url)
+    if cached is not None:
+        return _preview_payload(cached)
+    if _get_ytdlp() is None:
+        raise HTTPException(status_code=503, detail=_YTDLP_MISSING)
+
+    # Identical URLs requested while a probe is already running share its result
+    # instead of starting another yt-dlp extraction.
+    with _preview_lock:
+        inflight = _inflight.get(url)
+        if inflight is None:
+            inflight = _InflightPreview(future=_preview_executor.submit(_extract_preview, url))
+            _inflight[url] = inflight
+            leader = True
+        else:
+            inflight.waiters += 1
+            leader = False
+
+    if leader:
+        inflight.future.add_done_callback(lambda _f: _forget_inflight(url, inflight))
 
+    try:
+        # shield(): a timed-out waiter must not cancel the probe other callers share.
+        p = await asyncio.wait_for(
+            asyncio.shield(asyncio.wrap_future(inflight.future)),
+            timeout=PREVIEW_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        return {"ok": False, "url": url, "error": "Preview-ul a durat prea mult. Încearcă din nou."}
     except Exception as exc:  # noqa: BLE001
         return {"ok": False, "url": url, "error": str(exc) or exc.__class__.__name__}
 
+    response.headers["X-Preview-Coalesced"] = str(inflight.waiters)
+    return _preview_payload(p)
+
 
 @app.post("/download", response_class=HTMLResponse)
 def start_download(
@@ -643,7 +1095,19 @@ def start_download(
     if not url:
         raise HTTPException(status_code=400, detail="URL gol")
 
-    job_id = uuid.uuid4().hex
+    if _get_ytdlp() is None:
+        raise HTTPException(status_code=503, detail=_YTDLP_MISSING)
+
+    _reap_jobs()
+    if not _pending.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Prea multe descărcări în așteptare. Încearcă din nou în câteva momente.",
+        )
+
+    # 64 random bits is plenty for a per-process registry, and shorter ids leave more
+    # of the Windows MAX_PATH budget for the sanitized filename.
+    job_id = sys.intern(secrets.token_hex(8))
     job = Job(
         id=job_id,
         status="queued",
@@ -651,10 +1115,16 @@ def start_download(
         audio_format=audio_format,
         url=url,
     )
-    _jobs[job_id] = job
+    _register_job(job)
 
-    future = _executor.submit(_run_ytdlp, job_id)
-    _futures[job_id] = future
+    try:
+        future = _executor.submit(_run_ytdlp, job_id)
+    except Exception:
+        _unregister_job(job_id)
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _f: _pending.release())
+    _track_future(job_id, future)
 
     # IMPORTANT (Apache / reverse-proxy):
     # Do not issue redirects that may expose the backend host (127.0.0.1:8000).
@@ -671,7 +1141,7 @@ def start_download(
 
 @app.get("/jobs/{job_id}", response_class=HTMLResponse)
 def job_page(request: Request, job_id: str):
-    job = _jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job inexistent")
 
@@ -684,11 +1154,7 @@ def job_page(request: Request, job_id: str):
     )
 
 
-@app.get("/api/jobs/{job_id}")
-def job_status(job_id: str):
-    job = _jobs.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job inexistent")
+def _job_payload(job: Job) -> dict[str, object]:
     return {
         "id": job.id,
         "status": job.status,
@@ -699,9 +1165,59 @@ def job_status(job_id: str):
     }
 
 
+@app.get("/api/jobs/{job_id}")
+def job_status(job_id: str):
+    # Kept for scripts/older pages; the UI prefers /api/jobs/{job_id}/stream.
+    job = _get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job inexistent")
+    return _job_payload(job)
+
+
+async def _job_events(job: Job):
+    event = asyncio.Event()
+    listener = (asyncio.get_running_loop(), event)
+    _, lock = _shard_for(job.id)
+    with lock:
+        job.listeners.add(listener)
+    try:
+        last: dict[str, object] | None = None
+        while True:
+            # Clear before reading so a change landing in between re-wakes us.
+            event.clear()
+            payload = _job_payload(job)
+            if payload != last:
+                yield b"data: " + orjson.dumps(payload) + b"\n\n"
+                last = payload
+            # Decide on the snapshot just sent, so the final state always goes out.
+            if payload["status"] in ("done", "error"):
+                return
+            try:
+                await asyncio.wait_for(event.wait(), timeout=15)
+            except asyncio.TimeoutError:
+                # Comment line keeps idle proxies from closing the connection.
+                yield b": keep-alive\n\n"
+    finally:
+        with lock:
+            job.listeners.discard(listener)
+
+
+@app.get("/api/jobs/{job_id}/stream")
+def job_stream(job_id: str):
+    # Server-Sent Events: one message per status change instead of client-side polling.
+    job = _get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job inexistent")
+    return StreamingResponse(
+        _job_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/files/{job_id}")
 def download_file(job_id: str):
-    job = _jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job inexistent")
     if job.status != "done" or not job.filename:
@@ -711,10 +1227,18 @@ def download_file(job_id: str):
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="Fișierul nu a fost găsit")
 
-    return FileResponse(
+    # Stable validators let browsers/download managers resume with Range requests.
+    st = file_path.stat()
+    return ZeroCopyFileResponse(
         path=str(file_path),
         filename=job.filename,
-        media_type="application/octet-stream",
+        media_type=mimetypes.guess_type(job.filename)[0] or "application/octet-stream",
+        stat_result=st,
+        headers={
+            "ETag": f'"{job_id}-{st.st_size:x}-{int(st.st_mtime):x}"',
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, max-age=3600",
+        },
     )
 
 
@@ -724,7 +1248,7 @@ def health():
 
 
 def _ffmpeg_in_path() -> bool:
-    return _ffmpeg_dir() is not None
+    return FFMPEG_DIR is not None
 
 
 @app.get("/diagnostics")
@@ -732,8 +1256,11 @@ def diagnostics():
     return {
         "build": APP_BUILD,
         "ffmpeg_in_path": _ffmpeg_in_path(),
-        "ffmpeg_location": str(_ffmpeg_dir()) if _ffmpeg_dir() else None,
+        "ffmpeg_location": str(FFMPEG_DIR) if FFMPEG_DIR else None,
         "downloads_dir": str(DOWNLOADS_DIR),
+        "worker_threads": WORKER_THREADS,
+        "queue_depth": _queue_depth(),
+        "max_pending_jobs": MAX_PENDING_JOBS,
         "cwd": os.getcwd(),
     }
 
@@ -742,7 +1269,38 @@ def diagnostics():
 def debug_build():
     return {
         "build": APP_BUILD,
-        "frozen": bool(getattr(sys, "frozen", False)),
+        "frozen": FROZEN,
         "project_dir": str(PROJECT_DIR),
         "downloads_dir": str(DOWNLOADS_DIR),
     }
+
+
+_LOOPBACK_HOSTS = frozenset({"127.0.0.1", "::1", "localhost"})
+
+
+def _is_local_request(request: Request) -> bool:
+    # Anything that went through Apache carries X-Forwarded-* headers, even when the
+    # proxy itself connects from 127.0.0.1.
+    if any(key.startswith("x-forwarded-") for key in request.headers.keys()):
+        return False
+    return request.client is not None and request.client.host in _LOOPBACK_HOSTS
+
+
+@app.post("/admin/refresh-config")
+def refresh_config(request: Request):
+    global FFMPEG_DIR, COOKIEFILE, _YDL_TEMPLATES
+
+    if not _is_local_request(request):
+        raise HTTPException(status_code=403, detail="Disponibil doar local.")
+
+    _ffmpeg_dir.cache_clear()
+    _maybe_cookiefile.cache_clear()
+    FFMPEG_DIR = _ffmpeg_dir()
+    COOKIEFILE = _maybe_cookiefile()
+    _YDL_TEMPLATES = _build_ydl_templates(FFMPEG_DIR, COOKIEFILE)
+    _clear_ydl_pool()
+    return {
+        "ok": True,
+        "ffmpeg_location": str(FFMPEG_DIR) if FFMPEG_DIR else None,
+        "cookiefile": COOKIEFILE is not None,
+    }
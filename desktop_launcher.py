@@ -1,118 +1,83 @@
 from __future__ import annotations
 
-import os
+import http.client
 import socket
+import sys
 import threading
 import time
-import traceback
-import urllib.request
+import urllib.parse
 import webbrowser
-import sys
-
-import uvicorn
 
+from app._launcher_common import ENV, HOST, get_asgi_app, run_server, write_fatal_log
 
-def _appdata_dir() -> str:
-    base = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")
-    if base:
-        return os.path.join(base, "VixfloStream Downloader")
-    return os.path.join(os.path.expanduser("~"), "VixfloStream Downloader")
 
-
-def _pick_writable_dir(*candidates: str) -> str:
-    for d in candidates:
-        try:
-            os.makedirs(d, exist_ok=True)
-            probe = os.path.join(d, ".write_test")
-            with open(probe, "w", encoding="utf-8") as f:
-                f.write("ok")
-            try:
-                os.remove(probe)
-            except Exception:
-                pass
-            return d
-        except Exception:
-            continue
-    return candidates[0] if candidates else os.getcwd()
-
-
-def _get_asgi_app():
-    # IMPORTANT for PyInstaller builds:
-    # If we pass a string like "app.main:app", Uvicorn imports it dynamically at
-    # runtime and PyInstaller may not bundle the local `app` package.
-    from app.main import app as asgi_app  # noqa: WPS433
-
-    return asgi_app
-
-
-def _safe_uvicorn_log_config(log_path: str, level: str) -> dict:
-    # In PyInstaller `--noconsole`, Uvicorn's default logging formatter can crash
-    # because it may call `stream.isatty()` on a missing/None stream.
-    return {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "format": "%(asctime)s %(levelname)s %(name)s: %(message)s",
-            },
-        },
-        "handlers": {
-            "file": {
-                "class": "logging.FileHandler",
-                "formatter": "default",
-                "filename": log_path,
-                "encoding": "utf-8",
-            },
-        },
-        "loggers": {
-            "uvicorn": {"handlers": ["file"], "level": level.upper(), "propagate": False},
-            "uvicorn.error": {"handlers": ["file"], "level": level.upper(), "propagate": False},
-            "uvicorn.access": {"handlers": ["file"], "level": level.upper(), "propagate": False},
-        },
-    }
-
-
-def _write_fatal_log(where: str, exc: BaseException) -> None:
-    try:
-        exe_dir = os.path.dirname(os.path.abspath(getattr(__import__("sys"), "executable", "")))
-        log_dir = _pick_writable_dir(
-            os.path.join(exe_dir, "logs"),
-            os.path.join(_appdata_dir(), "logs"),
-            os.path.join(os.environ.get("TEMP", os.getcwd()), "VixfloStreamDownloader", "logs"),
-        )
-        path = os.path.join(log_dir, where)
-        with open(path, "a", encoding="utf-8") as f:
-            f.write("\n=== FATAL ===\n")
-            f.write(time.strftime("%Y-%m-%d %H:%M:%S"))
-            f.write("\n")
-            f.write(repr(exc))
-            f.write("\n")
-            f.write(traceback.format_exc())
-            f.write("\n")
-    except Exception:
-        pass
+def _wait_for_port(host: str, port: int, deadline: float) -> bool:
+    # A bare TCP connect is much cheaper than an HTTP round trip per attempt.
+    while time.time() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.1)
+            if s.connect_ex((host, port)) == 0:
+                return True
+        time.sleep(0.05)
+    return False
 
 
 def _open_when_ready(open_url: str, health_url: str, timeout_s: float = 20.0) -> None:
     deadline = time.time() + timeout_s
-    while time.time() < deadline:
+    parts = urllib.parse.urlsplit(health_url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or 80
+
+    # The pre-bound socket accepts connections before the app has finished starting,
+    # so once the port answers, confirm with /health before opening the browser.
+    if _wait_for_port(host, port, deadline):
+        path = parts.path or "/"
+        # One keep-alive connection for all probes; rebuilt only after a failure.
+        conn = http.client.HTTPConnection(host, port, timeout=1.0)
         try:
-            with urllib.request.urlopen(health_url, timeout=1.0) as resp:
-                if 200 <= resp.status < 300:
-                    webbrowser.open(open_url)
-                    return
-        except Exception:
-            time.sleep(0.3)
+            while time.time() < deadline:
+                try:
+                    conn.request("GET", path)
+                    resp = conn.getresponse()
+                    resp.read()
+                    if 200 <= resp.status < 300:
+                        break
+                except Exception:
+                    conn.close()
+                    conn = http.client.HTTPConnection(host, port, timeout=1.0)
+                time.sleep(0.05)
+        finally:
+            conn.close()
 
     webbrowser.open(open_url)
 
 
+def _tune_listen_socket(sock: socket.socket) -> None:
+    # On Windows SO_REUSEADDR lets other processes hijack the port, so only use it elsewhere.
+    if sys.platform != "win32":
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        except (AttributeError, OSError):
+            pass
+    # Avoid Nagle/delayed-ACK stalls on small responses (inherited by accepted sockets).
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+
 def main() -> None:
     try:
-        host = os.environ.get("AVE_HOST", "127.0.0.1")
+        host = HOST
+        env_port = ENV.get("AVE_PORT")
+        env_open_url = ENV.get("AVE_OPEN_URL")
+
+        # Start importing the app (FastAPI, yt-dlp, ...) while we set up sockets and logging.
+        # The AVE_* values come from the ENV snapshot, so app.main's load_dotenv() can't change them.
+        threading.Thread(target=get_asgi_app, name="app-import", daemon=True).start()
 
         # Prefer a random free port to avoid conflicts with Apache/Uvicorn instances.
-        env_port = os.environ.get("AVE_PORT")
         fixed_port = int(env_port) if env_port else None
 
         sock: socket.socket | None = None
@@ -121,6 +86,7 @@ def main() -> None:
             port = fixed_port
         else:
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            _tune_listen_socket(sock)
             sock.bind((host, 0))
             sock.listen(128)
             port = int(sock.getsockname()[1])
@@ -128,10 +94,13 @@ def main() -> None:
         # URL-ul pe care îl deschide aplicația în browser.
         # Pentru testare/local: http://127.0.0.1:8000/
         # Pentru Apache/HTTPS: setează AVE_OPEN_URL=https://vixflodev.ro/VixfloStream/
-        open_url = os.environ.get("AVE_OPEN_URL", f"http://{host}:{port}/")
+        open_url = env_open_url or f"http://{host}:{port}/"
 
         health_url = f"http://{host}:{port}/health"
 
+        # Finish the import before the readiness watcher starts counting down.
+        asgi_app = get_asgi_app()
+
         opener = threading.Thread(
             target=_open_when_ready,
             args=(open_url, health_url),
@@ -139,41 +108,11 @@ def main() -> None:
         )
         opener.start()
 
-        log_level = os.environ.get("AVE_LOG_LEVEL", "info")
-
-        log_config = None
-        if getattr(sys, "frozen", False):
-            exe_dir = os.path.dirname(os.path.abspath(sys.executable))
-            log_dir = _pick_writable_dir(
-                os.path.join(exe_dir, "logs"),
-                os.path.join(_appdata_dir(), "logs"),
-                os.path.join(os.environ.get("TEMP", os.getcwd()), "VixfloStreamDownloader", "logs"),
-            )
-            log_config = _safe_uvicorn_log_config(
-                os.path.join(log_dir, "uvicorn-launcher.log"),
-                level=log_level,
-            )
-
-        asgi_app = _get_asgi_app()
-
-        config = uvicorn.Config(
-            asgi_app,
-            host=host,
-            port=port,
-            log_level=log_level,
-            log_config=log_config,
-            proxy_headers=True,
-            forwarded_allow_ips="*",
-        )
-        server = uvicorn.Server(config)
-
         # If we created our own socket (random port), pass it to Uvicorn so it uses that port.
-        if sock is not None:
-            server.run(sockets=[sock])
-        else:
-            server.run()
+        sockets = [sock] if sock is not None else None
+        run_server(asgi_app, host, port, "uvicorn-launcher.log", sockets=sockets)
     except Exception as exc:  # noqa: BLE001
-        _write_fatal_log("VixfloStreamDownloader-fatal.log", exc)
+        write_fatal_log("VixfloStreamDownloader-fatal.log", exc)
         raise
 
 